@@ -5,7 +5,7 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
-        "yt-dlp>=2023.0.0",
+        "yt-dlp>=2025.1.15",
         "requests>=2.31.0",
         "beautifulsoup4>=4.12.0",
         "websockets>=12.0",
@@ -13,6 +13,9 @@ setup(
         "mutagen>=1.47.0",
         "pycryptodomex>=3.19.0",
     ],
+    extras_require={
+        "fast": ["ijson>=3.1", "orjson>=3.9"],
+    },
     entry_points={
         "console_scripts": [
             "videograbber=videograbber.main:main",
@@ -0,0 +1,37 @@
+"""Formatting helpers shared by the downloader and the info.json reader."""
+
+from datetime import date
+from functools import lru_cache
+
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+@lru_cache(maxsize=4096)
+def format_duration(duration_secs):
+    """Convert seconds to HH:MM:SS format"""
+    if not duration_secs:
+        return "Unknown"
+    hours = int(duration_secs // 3600)
+    minutes = int((duration_secs % 3600) // 60)
+    seconds = int(duration_secs % 60)
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+@lru_cache(maxsize=4096)
+def format_date(date_str):
+    """Format date string to be more readable"""
+    if not date_str:
+        return "Unknown"
+    # yt-dlp always emits YYYYMMDD, so slice it instead of going through strptime
+    if (not isinstance(date_str, str) or len(date_str) != 8
+            or not date_str.isascii() or not date_str.isdigit()):
+        return date_str
+    year, month, day = int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])
+    try:
+        date(year, month, day)  # Rejects impossible dates such as February 30
+    except ValueError:
+        return date_str
+    return f"{_MONTHS[month - 1]} {day:02d}, {date_str[:4]}"
@@ -2,34 +2,28 @@
 import json
 import sys
 from pathlib import Path
-from datetime import datetime
 
-def format_duration(duration_secs):
-    """Convert seconds to HH:MM:SS format"""
-    if not duration_secs:
-        return "Unknown"
-    hours = int(duration_secs // 3600)
-    minutes = int((duration_secs % 3600) // 60)
-    seconds = int(duration_secs % 60)
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    return f"{minutes:02d}:{seconds:02d}"
+try:
+    import orjson
+except ImportError:  # Optional, falls back to the stdlib parser
+    orjson = None
 
-def format_date(date_str):
-    """Format date string to be more readable"""
-    if not date_str:
-        return "Unknown"
-    try:
-        date = datetime.strptime(date_str, "%Y%m%d")
-        return date.strftime("%B %d, %Y")
-    except:
-        return date_str
+from videograbber.formatting import format_date, format_duration
+
+# Top-level info.json keys used by read_info_json
+INFO_KEYS = ("title", "uploader", "upload_date", "duration", "width", "height", "view_count", "webpage_url")
+
+def load_info_fields(file_path, keys=INFO_KEYS):
+    """Load only the given top-level keys from an info.json file, parsed with orjson when installed."""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return {key: data[key] for key in keys if key in data}
 
 def read_info_json(file_path):
     """Read and extract essential information from info.json file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_info_fields(file_path)
             
         # Extract only the essential information
         info = {
@@ -48,7 +42,7 @@ def read_info_json(file_path):
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python json_info_reader.py <path_to_info.json>")
+        print("Usage: python -m videograbber.json_info_reader <path_to_info.json>")
         sys.exit(1)
     
     file_path = Path(sys.argv[1])
@@ -1,14 +1,38 @@
-import subprocess
+import asyncio
+import atexit
 import json
 import os
+import hashlib
 import tempfile
-import time  # Add import for time.sleep
+import threading
+import uuid
+import time
 import platform
+import re
+import shutil
+import stat
 from pathlib import Path
-from typing import Optional, Dict, List, Union
+from typing import Optional, Dict, List, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime
-import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cache
+
+try:
+    import orjson
+except ImportError:  # Optional, falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional, falls back to parsing the whole file
+    ijson = None
+
+from yt_dlp import YoutubeDL
+from yt_dlp.cookies import extract_cookies_from_browser
+from yt_dlp.utils import parse_bytes
+
+from videograbber.formatting import format_date, format_duration
 
 # Browser profile paths by OS
 BROWSER_PATHS = {
@@ -29,6 +53,21 @@ BROWSER_PATHS = {
     }
 }
 
+# Exported cookies are reused for this long (seconds) if the browser's cookie DB is unchanged
+COOKIE_CACHE_MAX_AGE = 30 * 60
+
+# Parsed browser profiles, as {browser: (profile file st_mtime_ns, profiles)}
+_profile_cache: Dict[str, Tuple[int, Dict[str, str]]] = {}
+
+# Serializes cookie exports across threads and SocialMediaDL instances
+_COOKIE_EXPORT_LOCK = threading.Lock()
+
+# Errors meaning the browser's cookie store could not be located
+NO_COOKIES_RE = re.compile(r"could not find|no such profile", re.IGNORECASE)
+
+# Extensions (without the dot) of the media files downloads can produce
+VIDEO_EXTENSIONS = {"mkv", "mp4", "webm"}
+
 @dataclass
 class DownloadResult:
     success: bool
@@ -36,27 +75,21 @@ class DownloadResult:
     error: Optional[str]
     metadata: Optional[Dict]
 
-def format_duration(duration_secs):
-    """Convert seconds to HH:MM:SS format"""
-    if not duration_secs:
-        return "Unknown"
-    hours = int(duration_secs // 3600)
-    minutes = int((duration_secs % 3600) // 60)
-    seconds = int(duration_secs % 60)
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-    return f"{minutes:02d}:{seconds:02d}"
-
-def format_date(date_str):
-    """Format date string to be more readable"""
-    if not date_str:
-        return "Unknown"
-    try:
-        date = datetime.strptime(date_str, "%Y%m%d")
-        return date.strftime("%B %d, %Y")
-    except:
-        return date_str
+@cache
+def _shared_tempdir() -> Path:
+    """Create the process-wide temp directory on first use; it is removed at exit."""
+    path = Path(tempfile.mkdtemp(prefix="videograbber-"))
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
+def parse_size(value: str) -> int:
+    """Parse a human readable size such as '10M' into bytes"""
+    size = parse_bytes(value)
+    if size is None:
+        raise ValueError(f"Invalid size: {value}")
+    return size
 
+@cache
 def get_browser_path(browser: str) -> str:
     """Get the browser path for the current operating system."""
     system = platform.system()
@@ -78,8 +111,22 @@ def list_browser_profiles(browser: str) -> Dict[str, str]:
     """
     List available profiles for a browser and their directory names.
     Returns a dictionary of {display_name: directory_name}
+    
+    The result is cached until the browser rewrites its profile file; treat it
+    as read-only.
     """
     base_path = Path(get_browser_path(browser))
+    profiles_file = base_path / ("profiles.ini" if browser == "firefox" else "Local State")
+    try:
+        mtime_ns = profiles_file.stat().st_mtime_ns
+    except OSError:
+        return {}
+    
+    # Reuse the last parse unless the file changed since
+    cached = _profile_cache.get(browser)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
     profiles = {}
     
     if browser in ["brave", "chrome"]:
@@ -87,9 +134,15 @@ def list_browser_profiles(browser: str) -> Dict[str, str]:
         local_state = base_path / "Local State"
         if local_state.exists():
             try:
-                with open(local_state, 'r', encoding='utf-8') as f:
-                    state = json.load(f)
-                profile_info = state.get("profile", {}).get("info_cache", {})
+                # Local State can run to several MB for heavily used browsers, but
+                # only the profile.info_cache subtree is needed
+                with open(local_state, 'rb') as f:
+                    if ijson is not None:
+                        profile_info = next(ijson.items(f, "profile.info_cache"), {})
+                    else:
+                        raw_state = f.read()
+                        state = orjson.loads(raw_state) if orjson is not None else json.loads(raw_state)
+                        profile_info = state.get("profile", {}).get("info_cache", {})
                 
                 # Map profile directories to their display names
                 for dir_name, info in profile_info.items():
@@ -116,8 +169,92 @@ def list_browser_profiles(browser: str) -> Dict[str, str]:
             except Exception as e:
                 print(f"Error reading Firefox profiles: {e}")
     
+    _profile_cache[browser] = (mtime_ns, profiles)
     return profiles
 
+def get_cookie_db_path(browser: str, profile_dir: str) -> Optional[Path]:
+    """Locate the cookie database of a browser profile, if it exists."""
+    profile_path = Path(get_browser_path(browser)) / profile_dir
+    if browser == "firefox":
+        candidates = [profile_path / "cookies.sqlite"]
+    else:
+        # Newer Chromium versions keep cookies under Network/
+        candidates = [profile_path / "Network" / "Cookies", profile_path / "Cookies"]
+    
+    for path in candidates:
+        if path.exists():
+            return path
+    return None
+
+def get_browser_spec(browser: str, profile_dir: str) -> Tuple[str, ...]:
+    """Build the browser spec yt-dlp's cookie extractor expects for a profile directory."""
+    if browser in ["brave", "chrome"]:
+        return (browser, f"{get_browser_path(browser)}/{profile_dir}")
+    elif browser == "firefox":
+        return ("firefox", profile_dir)
+    return (browser,)
+
+def _is_private(st: os.stat_result) -> bool:
+    """Whether a stat result belongs to the current user and is closed to everyone else."""
+    if not hasattr(os, "getuid"):  # Windows: the temp directory is already per-user
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+def get_cookie_cache_dir() -> Path:
+    """
+    Per-user directory holding cookie exports, created with mode 0700 on first use.
+    
+    Exports hold every browser cookie in plain text, so a directory that is a
+    symlink, belongs to someone else or is readable by others is refused.
+    """
+    suffix = f"-{os.getuid()}" if hasattr(os, "getuid") else ""
+    cache_dir = Path(tempfile.gettempdir()) / f"videograbber-cookies{suffix}"
+    try:
+        cache_dir.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(cache_dir)
+    if not stat.S_ISDIR(st.st_mode) or not _is_private(st):
+        raise Exception(
+            f"Refusing to use cookie cache directory {cache_dir}: "
+            f"it must be a directory owned by you with mode 0700"
+        )
+    return cache_dir
+
+def get_cookie_cache_path(browser_spec: Tuple[str, ...]) -> Path:
+    """Path of the cached cookies export for a browser profile."""
+    cache_key = hashlib.sha1(":".join(browser_spec).encode()).hexdigest()
+    return get_cookie_cache_dir() / f"vg_cookies_{cache_key}.txt"
+
+def prune_cookie_cache() -> None:
+    """Delete cookie exports (and leftover partial writes) older than COOKIE_CACHE_MAX_AGE."""
+    cutoff = time.time() - COOKIE_CACHE_MAX_AGE
+    for entry in os.scandir(get_cookie_cache_dir()):
+        try:
+            if entry.name.startswith("vg_cookies_") and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+def get_fresh_cookie_cache(browser: str, profile_dir: str) -> Optional[Path]:
+    """
+    Return the cached cookies export for a profile if it can still be used, i.e. it
+    is younger than COOKIE_CACHE_MAX_AGE and the browser's cookie DB is unchanged.
+    """
+    cookies_path = get_cookie_cache_path(get_browser_spec(browser, profile_dir))
+    cookie_db = get_cookie_db_path(browser, profile_dir)
+    try:
+        st = os.lstat(cookies_path)
+    except OSError:
+        return None
+    # Only trust a regular file we wrote ourselves
+    if not stat.S_ISREG(st.st_mode) or not _is_private(st):
+        return None
+    if (cookie_db and cookie_db.stat().st_mtime <= st.st_mtime
+            and time.time() - st.st_mtime < COOKIE_CACHE_MAX_AGE):
+        return cookies_path
+    return None
+
 def get_profile_directory(browser: str, profile_name: Optional[str] = None) -> str:
     """Get the actual profile directory name from a display name or directory name."""
     if not profile_name:
@@ -141,121 +278,137 @@ def get_profile_directory(browser: str, profile_name: Optional[str] = None) -> s
     )
 
 class SocialMediaDL:
+    # Invariant yt-dlp options, merged with the per-call ones
+    _BASE_OPTS: Dict = {
+        "merge_output_format": "mkv",  # Merge into MKV to support any codec combination
+        "nocheckcertificate": True,
+        "geo_bypass": True,
+        "noplaylist": True,
+        "source_address": "0.0.0.0",  # Force IPv4
+        "retries": 10,
+        "file_access_retries": 10,
+        "fragment_retries": 10,
+        "retry_sleep_functions": {"http": lambda n: 3},
+        "buffersize": 1024 * 1024,  # Fewer, larger reads/writes per chunk
+        "noprogress": False,  # Progress lines are written live, even in quiet mode
+        "progress_with_newline": True,
+        # Tag each progress line with its video so concurrent downloads stay readable
+        "progress_template": {"download": "[download] %(info.id)s: %(progress._default_template)s"},
+        "prefer_insecure": True,
+        "quiet": True,
+    }
+    _LIST_FORMATS_OPTS: Dict = {
+        "quiet": True,
+        "no_warnings": True,
+    }
+
     def __init__(
         self,
         output_dir: str = "~/videograbber-downloads",
         cookies_file: Optional[str] = None,
         username: Optional[str] = None,
-        password: Optional[str] = None
+        password: Optional[str] = None,
+        concurrent_fragments: int = 8,
+        chunk_size: int = 10 * 1024 * 1024,
+        debug: bool = False,
+        connections: int = 8
     ):
         self.output_dir = Path(output_dir).expanduser().resolve()
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.cookies_file = Path(cookies_file).expanduser() if cookies_file else None
         self.username = username
         self.password = password
+        self.concurrent_fragments = concurrent_fragments
+        self.chunk_size = chunk_size
+        self.debug = debug
+        self.connections = connections
         self._temp_dir = None
 
     def __enter__(self):
-        """Context manager entry to create temp directory"""
-        self._temp_dir = tempfile.mkdtemp()
+        """Context manager entry to attach the shared temp directory"""
+        self._temp_dir = _shared_tempdir()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit to cleanup temp files"""
-        if self._temp_dir and os.path.exists(self._temp_dir):
-            # Clean up any cookie files
-            for file in Path(self._temp_dir).glob("*.txt"):
-                try:
-                    file.unlink()
-                except:
-                    pass
-            try:
-                os.rmdir(self._temp_dir)
-            except:
-                pass
+        """Context manager exit; the shared temp directory is cleaned up at process exit"""
+        self._temp_dir = None
 
-    def _build_auth_args(self) -> List[str]:
-        """Build authentication arguments for yt-dlp"""
-        args = []
-        if self.cookies_file and self.cookies_file.exists():
-            args.extend(["--cookies", str(self.cookies_file)])
+    def _build_auth_opts(self) -> Dict:
+        """
+        Build authentication options for yt-dlp
+        
+        The cookies file is not included: yt-dlp rewrites its cookie file on close,
+        so callers pass it a private copy instead (see _private_cookies).
+        """
+        opts = {}
         if self.username and self.password:
-            args.extend(["--username", self.username, "--password", self.password])
-        return args
-
-    def _run_command(self, command: List[str]) -> subprocess.CompletedProcess:
-        """Run a yt-dlp command and handle output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=False  # Don't raise exception, we'll handle errors
-            )
-            return result
-        except Exception as e:
-            raise Exception(f"Command execution failed: {str(e)}")
+            opts["username"] = self.username
+            opts["password"] = self.password
+        return opts
 
     def export_browser_cookies(self, url: str, browser: str = "brave", profile: Optional[str] = None) -> Path:
         """
-        Export cookies from browser to a file using best practices from yt-dlp documentation
+        Export cookies from browser to a file using yt-dlp's browser cookie extractor
         
         Args:
-            url: URL of the site to validate cookies against
+            url: URL the cookies are needed for (cookies for all sites are exported)
             browser: Browser to export from (default is 'brave')
             profile: Browser profile to use (e.g. 'Profile 1', 'Default', etc.)
+        
+        The exported file is cached per browser profile and reused for up to
+        COOKIE_CACHE_MAX_AGE seconds, as long as the browser's cookie database
+        has not been modified since the export. The cache lives in a per-user
+        0700 directory, and exports older than that are deleted whenever a new
+        one is written.
         """
-        if not self._temp_dir:
-            self._temp_dir = tempfile.mkdtemp()
-            
-        cookies_path = Path(self._temp_dir) / f"cookies_{browser}.txt"
-        
-        # Get browser base path and resolve profile directory
-        base_path = get_browser_path(browser)
-        profile_dir = get_profile_directory(browser, profile)
-        
-        # Handle browser-specific profile paths
-        browser_spec = browser
-        if browser in ["brave", "chrome"]:
-            browser_spec = f"{browser}:{base_path}/{profile_dir}"
-        elif browser == "firefox":
-            browser_spec = f"firefox:{profile_dir}"
-        
-        print(f"Using browser at: {browser_spec}")
-        
-        # Use appropriate user agent
-        user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        
-        # Export cookies without domain filter to support all sites
-        command = [
-            "yt-dlp",
-            "--cookies-from-browser",
-            browser_spec,
-            "--user-agent",
-            user_agent,
-            "--cookies",
-            str(cookies_path),
-            "--skip-download",
-            url
-        ]
-        
-        result = self._run_command(command)
-        if result.returncode != 0:
-            print(f"Cookie export error output: {result.stderr}")
-            if "could not find" in result.stderr:
-                raise Exception(
-                    f"Could not find browser cookies. Please make sure:\n"
-                    f"1. You have {browser} browser installed\n"
-                    f"2. You're logged into the site you're trying to download from\n"
-                    f"3. Your browser profile path is correct: {browser_spec}\n"
-                    f"4. Common profile names are: 'Default', 'Profile 1', 'Profile 2'"
-                )
-            raise Exception(f"Failed to export cookies: {result.stderr}")
-            
-        if not cookies_path.exists():
-            raise Exception("Cookies file was not created")
+        # Exports share one cache file per profile, and reading the browser DB
+        # concurrently is unreliable, so only one export runs at a time
+        with _COOKIE_EXPORT_LOCK:
+            # Resolve profile directory and the matching browser spec
+            profile_dir = get_profile_directory(browser, profile)
+            browser_spec = get_browser_spec(browser, profile_dir)
+        
+            # Reuse a previous export if the browser hasn't written new cookies since
+            cached_path = get_fresh_cookie_cache(browser, profile_dir)
+            if cached_path:
+                print(f"Using cached cookies: {cached_path}")
+                return cached_path
+        
+            cookies_path = get_cookie_cache_path(browser_spec)
+        
+            print(f"Using browser at: {':'.join(browser_spec)}")
+        
+            # Export cookies without domain filter to support all sites. The export is
+            # written to a private (0600) temp file and renamed into place, so readers
+            # never see a partial file
+            fd, partial_path = tempfile.mkstemp(prefix="vg_cookies_", suffix=".part", dir=cookies_path.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    extract_cookies_from_browser(*browser_spec).save(f)
+                os.replace(partial_path, cookies_path)
+            except Exception as e:
+                Path(partial_path).unlink(missing_ok=True)
+                message = str(e)
+                print(f"Cookie export error output: {message}")
+                # Only the end of the message matters, keep the search bounded
+                if NO_COOKIES_RE.search(message[-4096:]):
+                    raise Exception(
+                        f"Could not find browser cookies. Please make sure:\n"
+                        f"1. You have {browser} browser installed\n"
+                        f"2. You're logged into the site you're trying to download from\n"
+                        f"3. Your browser profile path is correct: {':'.join(browser_spec)}\n"
+                        f"4. Common profile names are: 'Default', 'Profile 1', 'Profile 2'"
+                    )
+                raise Exception(f"Failed to export cookies: {message}")
             
-        return cookies_path
+            prune_cookie_cache()
+            return cookies_path
+
+    def _resolve_cookies(self, url: str, browser: str, profile: Optional[str]) -> Path:
+        """Use the cookies file given at construction if there is one, else export from the browser"""
+        if self.cookies_file and self.cookies_file.exists():
+            return self.cookies_file
+        return self.export_browser_cookies(url, browser, profile)
 
     def download_video(
         self,
@@ -276,141 +429,338 @@ class SocialMediaDL:
             metadata_only (bool): Whether to only download metadata (default: False)
         """
         try:
-            # Export browser cookies
-            cookies_file = self.export_browser_cookies(url, browser, profile)
-            
-            # Prepare output directory - now using self.output_dir
-            output_dir = self.output_dir
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Build yt-dlp command
-            command = ["yt-dlp"]
-            if cookies_file:
-                command.extend(["--cookies", str(cookies_file)])
-            
-            # Create a temporary file for the full metadata
-            temp_info_json = Path(self._temp_dir) / "temp_info.json"
-            
-            # Add output template and other options
-            command.extend([
-                "-o", str(output_dir / "%(title)s [%(id)s].%(ext)s"),
-                "-f", format,  # Use specified format
-                "--write-info-json",
-                "--print-json",  # Print JSON to stdout for immediate access
-                "--merge-output-format", "mkv",  # Merge into MKV to support any codec combination
-                "--no-check-certificate",
-                "--geo-bypass",
-                "--no-playlist",
-                "--no-cache-dir",
-                "--force-ipv4",
-                "--retries", "10",
-                "--file-access-retries", "10",
-                "--fragment-retries", "10",
-                "--retry-sleep", "3",
-                "--progress",
-                "--newline",
-                "--verbose",
-                "--ignore-errors",
-                "--no-warnings",
-                "--prefer-insecure",
-                url  # Add URL at the end
-            ])
-            
-            # Run the command
-            print("Running download command:", " ".join(command))
-            result = self._run_command(command)
+            cookies_file = self._resolve_cookies(url, browser, profile)
+        except Exception as e:
+            print(f"Error: {e}")
+            return DownloadResult(
+                success=False,
+                file_path=None,
+                error=str(e),
+                metadata=None
+            )
+        
+        return self._download_with_private_cookies(url, cookies_file, format, metadata_only)
+
+    def download_many(
+        self,
+        urls: List[str],
+        browser: str = "brave",
+        profile: str = None,
+        format: str = "bestvideo+bestaudio/best",
+        metadata_only: bool = False,
+        jobs: int = 4
+    ) -> List[DownloadResult]:
+        """
+        Download several videos concurrently using a thread pool.
+        
+        Cookies are exported once and shared by every worker, so the browser's
+        cookie database is only read a single time for the whole batch. Repeated
+        URLs are downloaded once, since concurrent workers would otherwise write
+        the same output file.
+        
+        Args:
+            urls (List[str]): The URLs of the videos to download
+            browser (str): The browser to export cookies from (default: brave)
+            profile (str): The browser profile to use (default: None)
+            format (str): The format to download (default: bestvideo+bestaudio/best)
+            metadata_only (bool): Whether to only download metadata (default: False)
+            jobs (int): Maximum number of simultaneous downloads (default: 4)
+        
+        Returns:
+            One DownloadResult per URL, in the same order as `urls`
+        """
+        if not urls:
+            return []
+        
+        try:
+            cookies_file = self._resolve_cookies(urls[0], browser, profile)
+        except Exception as e:
+            print(f"Error: {e}")
+            return [
+                DownloadResult(success=False, file_path=None, error=str(e), metadata=None)
+                for _ in urls
+            ]
+        
+        unique_urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            results = dict(zip(unique_urls, executor.map(
+                lambda url: self._download_with_private_cookies(url, cookies_file, format, metadata_only),
+                unique_urls
+            )))
+        return [results[url] for url in urls]
+
+    async def download_video_async(
+        self,
+        url: str,
+        browser: str = "brave",
+        profile: str = None,
+        format: str = "bestvideo+bestaudio/best",
+        metadata_only: bool = False
+    ) -> DownloadResult:
+        """
+        Async variant of download_video for callers running an event loop.
+        
+        yt-dlp is synchronous, so the download runs in a worker thread and the
+        event loop stays free while it is in progress.
+        """
+        return await asyncio.to_thread(self.download_video, url, browser, profile, format, metadata_only)
+
+    async def download_many_async(
+        self,
+        urls: List[str],
+        browser: str = "brave",
+        profile: str = None,
+        format: str = "bestvideo+bestaudio/best",
+        metadata_only: bool = False,
+        jobs: int = 4
+    ) -> List[DownloadResult]:
+        """
+        Async variant of download_many, awaiting all downloads with asyncio.gather.
+        
+        At most `jobs` downloads run at once and repeated URLs are downloaded
+        once. Results are returned in the same order as `urls`.
+        """
+        if not urls:
+            return []
+        
+        try:
+            cookies_file = await asyncio.to_thread(self._resolve_cookies, urls[0], browser, profile)
+        except Exception as e:
+            print(f"Error: {e}")
+            return [
+                DownloadResult(success=False, file_path=None, error=str(e), metadata=None)
+                for _ in urls
+            ]
+        
+        semaphore = asyncio.Semaphore(max(1, jobs))
+        
+        async def download(url: str) -> DownloadResult:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._download_with_private_cookies, url, cookies_file, format, metadata_only
+                )
+        
+        unique_urls = list(dict.fromkeys(urls))
+        results = dict(zip(unique_urls, await asyncio.gather(*(download(url) for url in unique_urls))))
+        return [results[url] for url in urls]
+
+    def download_videos(
+        self,
+        urls: List[str],
+        browser: str = "brave",
+        profile: str = None,
+        format: str = "bestvideo+bestaudio/best",
+        metadata_only: bool = False
+    ) -> List[DownloadResult]:
+        """
+        Download several videos one after another with a single YoutubeDL instance.
+        
+        Cookies are exported once and yt-dlp's setup cost (extractor lookup, cookie
+        jar, network handlers) is paid once for the whole list.
+        
+        Args:
+            urls (List[str]): The URLs of the videos to download
+            browser (str): The browser to export cookies from (default: brave)
+            profile (str): The browser profile to use (default: None)
+            format (str): The format to download (default: bestvideo+bestaudio/best)
+            metadata_only (bool): Whether to only download metadata (default: False)
+        
+        Returns:
+            One DownloadResult per URL, in the same order as `urls`
+        """
+        if not urls:
+            return []
+        
+        try:
+            cookies_file = self._resolve_cookies(urls[0], browser, profile)
+            with self._private_cookies(cookies_file) as session_cookies, \
+                    YoutubeDL(self._build_download_opts(session_cookies, format)) as ydl:
+                return [self._download_one(ydl, url, metadata_only) for url in urls]
+        except Exception as e:
+            print(f"Error: {e}")
+            return [
+                DownloadResult(success=False, file_path=None, error=str(e), metadata=None)
+                for _ in urls
+            ]
+
+    def _build_download_opts(self, cookies_file: Optional[Path], format: str) -> Dict:
+        """Build the yt-dlp options used for downloads"""
+        # output_dir was created in __init__. Downloads recreate it if it goes missing,
+        # metadata-only runs do so in _download_one before writing the sidecar
+        ydl_opts = {
+            **self._BASE_OPTS,
+            "outtmpl": str(self.output_dir / "%(title)s [%(id)s].%(ext)s"),
+            "format": format,  # Use specified format
+            "concurrent_fragment_downloads": self.concurrent_fragments,  # Parallel HLS/DASH fragments
+            "http_chunk_size": self.chunk_size,
+            "verbose": self.debug,
+            "no_warnings": not self.debug,
+            **self._build_auth_opts(),
+        }
+        if cookies_file:
+            ydl_opts["cookiefile"] = str(cookies_file)
+        
+        # Split single-file downloads over several connections when aria2c is available
+        if self.connections > 1 and shutil.which("aria2c"):
+            ydl_opts["external_downloader"] = {"default": "aria2c"}
+            ydl_opts["external_downloader_args"] = {"aria2c": [
+                f"-x{self.connections}", f"-s{self.connections}", "-k1M", "--file-allocation=none"
+            ]}
+        
+        return ydl_opts
+
+    def _download_with_private_cookies(
+        self,
+        url: str,
+        cookies_file: Optional[Path],
+        format: str,
+        metadata_only: bool
+    ) -> DownloadResult:
+        """Download a single video using a private copy of a shared cookies file"""
+        with self._private_cookies(cookies_file) as worker_cookies:
+            return self._download_with_cookies(url, worker_cookies, format, metadata_only)
+
+    @contextmanager
+    def _private_cookies(self, cookies_file: Optional[Path]):
+        """
+        Yield a private copy of a cookies file, removed afterwards.
+        
+        yt-dlp writes the cookie jar back to its cookie file when it closes. Handing
+        it the original would let concurrent downloads clobber each other and would
+        bump the cookie cache's mtime, making a stale export look fresh.
+        """
+        if not cookies_file:
+            yield cookies_file
+            return
+        
+        private_copy = (self._temp_dir or _shared_tempdir()) / f"cookies_{uuid.uuid4().hex}.txt"
+        shutil.copyfile(cookies_file, private_copy)
+        try:
+            yield private_copy
+        finally:
+            private_copy.unlink(missing_ok=True)
+
+    def _download_with_cookies(
+        self,
+        url: str,
+        cookies_file: Optional[Path],
+        format: str,
+        metadata_only: bool
+    ) -> DownloadResult:
+        """Download a single video using an already exported cookies file"""
+        try:
+            with YoutubeDL(self._build_download_opts(cookies_file, format)) as ydl:
+                return self._download_one(ydl, url, metadata_only)
+        except Exception as e:
+            print(f"Error: {e}")
+            return DownloadResult(
+                success=False,
+                file_path=None,
+                error=str(e),
+                metadata=None
+            )
+
+    def _download_one(self, ydl: YoutubeDL, url: str, metadata_only: bool) -> DownloadResult:
+        """Download a single URL with a configured YoutubeDL and save its simplified metadata"""
+        # Run the download; the returned info dict is the full metadata
+        print(f"Downloading: {url}")
+        try:
+            full_metadata = ydl.extract_info(url, download=not metadata_only)
+            # Name produced by the output template, for when no filepath is reported
+            expected_path = Path(ydl.prepare_filename(full_metadata))
+        except Exception as e:
+            # yt-dlp has already printed its ERROR line, even with quiet set
+            return DownloadResult(
+                success=False,
+                file_path=None,
+                error=str(e),
+                metadata=None
+            )
+        
+        try:
+            # Extract only the essential information
+            simplified_metadata = {
+                "title": full_metadata.get("title", "Unknown"),
+                "creator": full_metadata.get("uploader", "Unknown"),
+                "upload_date": format_date(full_metadata.get("upload_date")),
+                "duration": format_duration(full_metadata.get("duration")),
+                "resolution": f"{full_metadata.get('width', '?')}x{full_metadata.get('height', '?')}",
+                "view_count": full_metadata.get("view_count", "Unknown"),
+                "url": full_metadata.get("webpage_url", "Unknown")
+            }
             
-            if result.returncode != 0:
-                print(f"Download error output: {result.stderr}")
-                return DownloadResult(
-                    success=False,
-                    file_path=None,
-                    error=result.stderr,
-                    metadata=None
+            # Save simplified metadata next to the media file, using yt-dlp's sanitized name
+            info_json_path = expected_path.with_suffix(".info.json")
+            if metadata_only:
+                # Nothing was downloaded, so yt-dlp has not created the directory
+                info_json_path.parent.mkdir(parents=True, exist_ok=True)
+            if orjson is not None:
+                info_json_path.write_bytes(orjson.dumps(simplified_metadata, option=orjson.OPT_INDENT_2))
+            else:
+                # Serialize first so the file is written in one go rather than per token
+                info_json_path.write_text(
+                    json.dumps(simplified_metadata, indent=2, ensure_ascii=False),
+                    encoding='utf-8'
                 )
             
-            # Try to parse the JSON output for metadata
-            try:
-                # Find the JSON line in the output
-                json_lines = [line for line in result.stdout.split('\n') if line.strip().startswith('{')]
-                if not json_lines:
-                    raise Exception("No JSON data found in output")
-                    
-                full_metadata = json.loads(json_lines[-1])  # Use the last JSON line
-                
-                # Extract only the essential information
-                simplified_metadata = {
-                    "title": full_metadata.get("title", "Unknown"),
-                    "creator": full_metadata.get("uploader", "Unknown"),
-                    "upload_date": format_date(full_metadata.get("upload_date")),
-                    "duration": format_duration(full_metadata.get("duration")),
-                    "resolution": f"{full_metadata.get('width', '?')}x{full_metadata.get('height', '?')}",
-                    "view_count": full_metadata.get("view_count", "Unknown"),
-                    "url": full_metadata.get("webpage_url", "Unknown")
-                }
-                
-                # Save simplified metadata
-                video_id = full_metadata.get("id", "unknown")
-                info_json_path = output_dir / f"{full_metadata['title']} [{video_id}].info.json"
-                with open(info_json_path, 'w', encoding='utf-8') as f:
-                    json.dump(simplified_metadata, f, indent=2, ensure_ascii=False)
-                
-                # Find the media file
-                if not metadata_only:
-                    # Give the filesystem a moment to sync
-                    time.sleep(0.5)
-                    
-                    # Try to find the video file
-                    video_files = list(output_dir.glob(f"*[{video_id}].*"))
-                    video_files = [f for f in video_files if f.suffix.lower() in ['.mkv', '.mp4', '.webm']]
-                    
+            # Find the media file
+            if not metadata_only:
+                # yt-dlp reports the final (post-merge) path of the file it wrote
+                requested_downloads = full_metadata.get("requested_downloads") or [{}]
+                reported_path = requested_downloads[0].get("filepath")
+                if reported_path and Path(reported_path).exists():
+                    video_files = [Path(reported_path)]
+                else:
+                    # Fall back to the file name the output template produces
+                    video_files = [
+                        expected_path.with_suffix(ext) for ext in ['.mkv', '.mp4', '.webm']
+                        if expected_path.with_suffix(ext).exists()
+                    ]
+
+                if video_files:
+                    video_path = video_files[0]
+                    # Check if file existed before this run by comparing modification time
+                    file_existed = (time.time() - video_path.stat().st_mtime) > 5
+                    if file_existed:
+                        print(f"File already exists: {video_path}")
+                    else:
+                        print(f"Downloaded to: {video_path}")
+                    print(f"Creator: {simplified_metadata['creator']}")
+                    return DownloadResult(
+                        success=True,
+                        file_path=video_path,
+                        error=None,
+                        metadata=simplified_metadata
+                    )
+                else:
+                    # Last resort: scan for any media file tagged with this video's id
+                    id_tag = f"[{full_metadata.get('id')}]"
+                    with os.scandir(self.output_dir) as entries:
+                        video_files = [
+                            Path(entry.path) for entry in entries
+                            if id_tag in entry.name
+                            and entry.name.rpartition('.')[2].lower() in VIDEO_EXTENSIONS
+                            and entry.is_file(follow_symlinks=False)
+                        ]
                     if video_files:
-                        video_path = video_files[0]
-                        # Check if file existed before this run by comparing modification time
-                        file_existed = (time.time() - video_path.stat().st_mtime) > 5
-                        if file_existed:
-                            print(f"File already exists: {video_path}")
-                        else:
-                            print(f"Downloaded to: {video_path}")
+                        print(f"File location: {video_files[0]}")
                         print(f"Creator: {simplified_metadata['creator']}")
                         return DownloadResult(
                             success=True,
-                            file_path=video_path,
+                            file_path=video_files[0],
                             error=None,
                             metadata=simplified_metadata
                         )
-                    else:
-                        # Just list the files without warnings
-                        all_files = list(output_dir.glob("*"))
-                        video_files = [f for f in all_files if f.suffix.lower() in ['.mkv', '.mp4', '.webm']]
-                        if video_files:
-                            print(f"File location: {video_files[0]}")
-                            print(f"Creator: {simplified_metadata['creator']}")
-                            return DownloadResult(
-                                success=True,
-                                file_path=video_files[0],
-                                error=None,
-                                metadata=simplified_metadata
-                            )
-                
-                return DownloadResult(
-                    success=True,
-                    file_path=None,
-                    error=None,
-                    metadata=simplified_metadata
-                )
-                
-            except Exception as e:
-                print(f"Error processing metadata: {e}")
-                return DownloadResult(
-                    success=False,
-                    file_path=None,
-                    error=str(e),
-                    metadata=None
-                )
-                
+            
+            return DownloadResult(
+                success=True,
+                file_path=None,
+                error=None,
+                metadata=simplified_metadata
+            )
+            
         except Exception as e:
-            print(f"Error: {e}")
+            print(f"Error processing metadata: {e}")
             return DownloadResult(
                 success=False,
                 file_path=None,
@@ -425,27 +775,71 @@ class SocialMediaDL:
         Args:
             url: Video URL to check formats for
         """
-        command = [
-            "yt-dlp",
-            "--list-formats",  # Show all available formats
-            "--no-warnings",
-            url
-        ]
-        
-        result = self._run_command(command)
-        if result.returncode == 0:
-            print("\nAvailable formats:")
-            print(result.stdout)
-        else:
-            raise Exception(f"Failed to list formats: {result.stderr}")
+        try:
+            with self._list_formats_session() as ydl:
+                info = ydl.extract_info(url, download=False)
+                print("\nAvailable formats:")
+                ydl.list_formats(info)
+        except Exception as e:
+            raise Exception(f"Failed to list formats: {str(e)}")
+
+    def list_formats_many(self, urls: List[str]) -> List[str]:
+        """
+        List available formats for several video URLs
+        
+        Uses one yt-dlp session for all URLs, so extractor setup is paid once. A URL
+        that fails is reported and skipped, and the remaining URLs are still listed.
+        
+        Args:
+            urls: Video URLs to check formats for
+        
+        Returns:
+            The URLs whose formats could not be listed
+        """
+        failed = []
+        with self._list_formats_session() as ydl:
+            for url in urls:
+                try:
+                    info = ydl.extract_info(url, download=False)
+                except Exception as e:
+                    print(f"Error ({url}): Failed to list formats: {str(e)}")
+                    failed.append(url)
+                    continue
+                print(f"\nAvailable formats for {url}:")
+                ydl.list_formats(info)
+        return failed
+
+    @contextmanager
+    def _list_formats_session(self):
+        """Yield a YoutubeDL for listing formats, using a private copy of the cookies file"""
+        cookies_file = self.cookies_file if self.cookies_file and self.cookies_file.exists() else None
+        with self._private_cookies(cookies_file) as session_cookies:
+            ydl_opts = {**self._LIST_FORMATS_OPTS, **self._build_auth_opts()}
+            if session_cookies:
+                ydl_opts["cookiefile"] = str(session_cookies)
+            with YoutubeDL(ydl_opts) as ydl:
+                yield ydl
 
 def main():
     """Command-line interface for VideoGrabber."""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Download videos from various social media platforms.")
     parser.add_argument("url", nargs="?", help="URL of the video to download")
+    parser.add_argument("--batch-file", help="File containing URLs to download, one per line")
+    parser.add_argument("--jobs", type=int, default=4,
+                      help="Number of videos to download in parallel (default: 4)")
+    parser.add_argument("--jobs-per-video", type=int, default=8,
+                      help="Number of fragments to download in parallel per video (default: 8)")
+    parser.add_argument("--chunk-size", type=parse_size, default="10M",
+                      help="Size of each HTTP request when downloading (default: 10M)")
+    parser.add_argument("--connections", type=int, default=8,
+                      help="Connections per file when aria2c is installed (default: 8)")
+    parser.add_argument("--debug", action="store_true", help="Print yt-dlp debug output and warnings")
     parser.add_argument("--browser", default="brave", choices=["brave", "chrome", "firefox"],
                       help="Browser to use for cookies (default: brave)")
     parser.add_argument("--profile", help="Browser profile to use (e.g., 'Profile 1')")
+    parser.add_argument("--cookies", help="Netscape cookies file to use instead of exporting from the browser")
     parser.add_argument("--format", help="Video format to download (default: bestvideo+bestaudio)")
     parser.add_argument("--list-formats", action="store_true", help="List available formats and exit")
     parser.add_argument("--list-profiles", action="store_true", help="List available browser profiles and exit")
@@ -463,26 +857,53 @@ def main():
             print(f"\nNo profiles found for {args.browser}")
         return
     
-    if not args.url:
+    urls = [args.url] if args.url else []
+    if args.batch_file:
+        with open(args.batch_file, 'r', encoding='utf-8') as f:
+            urls.extend(
+                line.strip() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+    
+    if not urls:
         parser.error("URL is required unless using --list-profiles")
     
-    with SocialMediaDL() as dl:
+    with SocialMediaDL(
+        cookies_file=args.cookies,
+        concurrent_fragments=args.jobs_per_video,
+        chunk_size=args.chunk_size,
+        debug=args.debug,
+        connections=args.connections
+    ) as dl:
         if args.list_formats:
-            dl.list_formats(args.url)
+            if len(urls) > 1:
+                if dl.list_formats_many(urls):
+                    exit(1)
+            else:
+                dl.list_formats(urls[0])
         else:
-            result = dl.download_video(
-                url=args.url,
+            download_kwargs = dict(
+                urls=urls,
                 browser=args.browser,
                 profile=args.profile,
                 format=args.format if args.format else "bestvideo+bestaudio/best"
             )
-            
-            if result.success:
-                print(f"File location: {result.file_path}")
-                if result.metadata:
-                    print(f"Creator: {result.metadata.get('creator', 'Unknown')}")
+            if args.jobs > 1 and len(urls) > 1:
+                results = dl.download_many(jobs=args.jobs, **download_kwargs)
             else:
-                print(f"Error: {result.error}")
+                # One yt-dlp session for the whole list
+                results = dl.download_videos(**download_kwargs)
+            
+            failed = False
+            for url, result in zip(urls, results):
+                if result.success:
+                    print(f"File location: {result.file_path}")
+                    if result.metadata:
+                        print(f"Creator: {result.metadata.get('creator', 'Unknown')}")
+                else:
+                    print(f"Error: {result.error}" if len(urls) == 1 else f"Error ({url}): {result.error}")
+                    failed = True
+            if failed:
                 exit(1)
 
 if __name__ == "__main__":